@@ -1,16 +1,31 @@
 import streamlit as st
+from streamlit_autorefresh import st_autorefresh
 import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.config import Config
+from botocore.exceptions import ClientError
 import pandas as pd
+import pyarrow as pa
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import json
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List
+from itertools import chain
+from types import SimpleNamespace
+from typing import Dict, Iterable, Iterator, List, Tuple
 import numpy as np
 import os
 
+# The OLS trendline needs statsmodels; import it once instead of on every render.
+# An installed but broken statsmodels (e.g. a mismatched scipy) counts as absent
+try:
+    import statsmodels.api  # noqa: F401
+    _HAS_STATSMODELS = True
+except ImportError:
+    _HAS_STATSMODELS = False
+
 # Configure page
 st.set_page_config(
     page_title="AI Pipeline Analytics Dashboard",
@@ -19,8 +34,208 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Larger connection pool for concurrent requests, adaptive client-side retry rate limiting
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=32,
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    tcp_keepalive=True
+)
+
+# Reruns inside the same window reuse fetched (or generated) data instead of rebuilding it
+CACHE_TTL_SECONDS = 30
+
+# Fallbacks for fields missing from a log item's analysis map
+ANALYSIS_DEFAULTS = {
+    'complexity': 'unknown', 'word_count': 0, 'has_code': False, 'has_question': False
+}
+
+COMPLEXITY_LEVELS = ['low', 'medium', 'high']
+
+# Only the attributes the dashboard reads; final_response and other large fields stay server-side
+LOG_ITEM_PROJECTION = (
+    'pipeline_id, #ts, user_message, analysis.complexity, analysis.word_count, '
+    'analysis.has_code, analysis.has_question, execution_time_ms, #st'
+)
+LOG_ITEM_ATTRIBUTE_NAMES = {'#ts': 'timestamp', '#st': 'status'}
+
+# Explicit schema so items missing optional attributes still produce every column
+LOG_ITEM_SCHEMA = pa.schema([
+    ('pipeline_id', pa.string()),
+    ('timestamp', pa.string()),
+    ('user_message', pa.string()),
+    ('analysis', pa.struct([
+        ('complexity', pa.string()),
+        ('word_count', pa.int64()),
+        ('has_code', pa.bool_()),
+        ('has_question', pa.bool_())
+    ])),
+    ('execution_time_ms', pa.int64()),
+    ('status', pa.string())
+])
+
+# Distinct datasets whose charts are kept; older figures are evicted first
+FIGURE_CACHE_ENTRIES = 32
+
+# Sample data for demonstration
+_SAMPLE_MESSAGES = np.array([
+    "How do I implement a REST API in Python?",
+    "What's the difference between supervised and unsupervised learning?",
+    "Can you help me debug this SQL query?",
+    "Explain neural networks in simple terms",
+    "How to deploy a machine learning model?",
+    "What are the best practices for data preprocessing?",
+    "Help me understand Docker containers",
+    "How do I optimize database performance?",
+    "What's the latest in AI research?",
+    "Can you review my Python code?"
+])
+# Per-message features, computed once and gathered by index for each mock record
+_MSG_HAS_Q = np.array(['?' in message for message in _SAMPLE_MESSAGES])
+_MSG_WC = np.array([len(message.split()) for message in _SAMPLE_MESSAGES])
+
+# Mock share of requests per complexity level (same mix as run_demo_dashboard),
+# and execution time range (ms) per level; all indexed like COMPLEXITY_LEVELS
+_COMPLEXITY_WEIGHTS = np.array([0.50, 0.35, 0.15])
+_EXEC_TIME_LOWS = np.array([200, 1000, 2000])
+_EXEC_TIME_HIGHS = np.array([1500, 3000, 5000])
+_COMPLEXITY_DTYPE = pd.CategoricalDtype(COMPLEXITY_LEVELS, ordered=True)
+_MOCK_STATUSES = ['SUCCESS', 'FAILED']
+
+LAMBDA_FUNCTIONS = ['InputAnalyzerFunction', 'ResponseEnhancerFunction', 'PipelineLoggerFunction']
+
+def _arrow_dtype(arrow_type: pa.DataType):
+    """types_mapper that keeps converted columns Arrow-backed"""
+    # Timestamps stay datetime64: pandas rejects Arrow timestamps in nlargest and friends
+    if pa.types.is_timestamp(arrow_type):
+        return None
+    return pd.ArrowDtype(arrow_type)
+
+def _arrow_to_pandas(table: pa.Table) -> pd.DataFrame:
+    """Convert an Arrow table once, without consolidating blocks or keeping the table alive"""
+    return table.to_pandas(types_mapper=_arrow_dtype, split_blocks=True, self_destruct=True)
+
+def _arrow_array(values, arrow_type: pa.DataType = None) -> pd.api.extensions.ExtensionArray:
+    """Wrap a NumPy column as an Arrow-backed pandas array"""
+    return pd.arrays.ArrowExtensionArray(pa.array(values, type=arrow_type))
+
+def _narrow_int(column: pd.Series, arrow_type: pa.DataType) -> pd.Series:
+    """Cast an integer column to a narrower Arrow type only if every value fits; else leave it"""
+    info = np.iinfo(arrow_type.to_pandas_dtype())
+    if column.empty or (info.min <= column.min() and column.max() <= info.max):
+        return column.astype(pd.ArrowDtype(arrow_type))
+    return column
+
+def _coerce_log_value(value, arrow_type: pa.DataType):
+    """Convert a drifted string or scalar toward the schema type; others pass through as is"""
+    if value is None:
+        return None
+    if pa.types.is_string(arrow_type):
+        return value if isinstance(value, str) else str(value)
+    if not isinstance(value, str):
+        return value
+    if pa.types.is_boolean(arrow_type):
+        return {'true': True, 'false': False}.get(value.strip().lower(), value)
+    try:
+        return int(float(value))
+    except ValueError:
+        return value
+
+def _coerce_log_item(item: Dict) -> Dict:
+    """Copy of a log item with each field coerced toward LOG_ITEM_SCHEMA"""
+    item = dict(item)
+    for field in LOG_ITEM_SCHEMA:
+        if field.name not in item:
+            continue
+        if pa.types.is_struct(field.type):
+            # A non-map analysis attribute is treated as missing, like the baseline's .get chain
+            analysis = item[field.name]
+            item[field.name] = {
+                sub.name: _coerce_log_value(analysis.get(sub.name), sub.type) for sub in field.type
+            } if isinstance(analysis, dict) else None
+        elif field.name != 'timestamp':
+            # Non-string timestamps stay as they are and fail below, as they always did
+            item[field.name] = _coerce_log_value(item[field.name], field.type)
+    return item
+
+def _log_items_table(items: List[Dict]) -> pa.Table:
+    """Arrow table of log items; drifted values are coerced, items that still don't fit dropped"""
+    try:
+        return pa.Table.from_pylist(items, schema=LOG_ITEM_SCHEMA)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    # Slow path, only taken when some item's types drifted: one bad item must
+    # not cost the whole real dataset
+    rows = []
+    for item in map(_coerce_log_item, items):
+        try:
+            pa.Table.from_pylist([item], schema=LOG_ITEM_SCHEMA)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            continue
+        rows.append(item)
+    return pa.Table.from_pylist(rows, schema=LOG_ITEM_SCHEMA)
+
+def _apply_column_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Store low-cardinality labels as categoricals, request flags as booleans and counts narrow"""
+    complexity = df['complexity'].astype('category')
+    extra_levels = [level for level in complexity.cat.categories if level not in COMPLEXITY_LEVELS]
+    df['complexity'] = complexity.cat.set_categories(COMPLEXITY_LEVELS + extra_levels, ordered=True)
+    df['status'] = df['status'].astype('category')
+    df['has_code'] = df['has_code'].astype(bool)
+    df['has_question'] = df['has_question'].astype(bool)
+    # Narrower buffers halve what Plotly and st.dataframe serialize; an out-of-range
+    # row keeps its column wide instead of failing the whole conversion
+    df['execution_time_ms'] = _narrow_int(df['execution_time_ms'], pa.int32())
+    df['word_count'] = _narrow_int(df['word_count'], pa.int16())
+    return df
+
+def _empty_metrics() -> Dict:
+    """Default KPIs for an empty or unreadable frame"""
+    return {
+        'total_executions': 0,
+        'success_rate': 0,
+        'avg_response_time': 0,
+        'avg_execution_time': 0,
+        'avg_word_count': 0,
+        'complexity_distribution': {},
+        'code_requests_percentage': 0,
+        'question_percentage': 0
+    }
+
+def _equals(column: pd.Series, value) -> np.ndarray:
+    """Boolean mask of column == value; categoricals compare integer codes, not strings"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        categories = column.cat.categories
+        if value not in categories:
+            return np.zeros(len(column), dtype=bool)
+        return column.cat.codes.to_numpy() == categories.get_loc(value)
+    return column.to_numpy() == value
+
+def _numeric_mean(column: pd.Series) -> float:
+    """Mean of the numeric values in a column, ignoring invalid entries; 0 if there are none"""
+    if not pd.api.types.is_numeric_dtype(column.dtype):
+        column = pd.to_numeric(column, errors='coerce')
+    values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = values[~np.isnan(values)]
+    return float(valid.mean()) if valid.size else 0
+
+def _code_counts(codes: np.ndarray, labels) -> Dict:
+    """Non-zero counts per label for integer codes (-1 = missing), most frequent first"""
+    counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+    order = np.argsort(-counts, kind='stable')
+    return {labels[i]: int(counts[i]) for i in order if counts[i]}
+
+def _value_counts(column: pd.Series) -> Dict:
+    """Non-zero counts per value, most frequent first"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return _code_counts(column.cat.codes.to_numpy(), column.cat.categories)
+    return column.value_counts().to_dict()
+
 class AIPipelineAnalytics:
     def __init__(self):
+        # One PCG64 generator for the instance's unseeded mock draws
+        self.rng = np.random.default_rng()
+        # (cache window, metrics) from the last mock CloudWatch build
+        self._cw_cache = None
         self.use_aws = self.setup_aws_clients()
         if not self.use_aws:
             st.warning("🔧 Running in demo mode with simulated data. Configure AWS credentials to use real data.")
@@ -28,13 +243,11 @@ class AIPipelineAnalytics:
     def setup_aws_clients(self):
         """Initialize AWS service clients"""
         try:
-            self.dynamodb = boto3.resource('dynamodb', region_name='us-east-2')
-            self.cloudwatch = boto3.client('cloudwatch', region_name='us-east-2')
-            self.stepfunctions = boto3.client('stepfunctions', region_name='us-east-2')
-            self.logs = boto3.client('logs', region_name='us-east-2')
-            
-            # Test AWS connection
-            boto3.client('sts').get_caller_identity()
+            clients = _aws_clients()
+            self.dynamodb = clients.dynamodb
+            self.cloudwatch = clients.cloudwatch
+            self.stepfunctions = clients.stepfunctions
+            self.logs = clients.logs
             return True
         except Exception as e:
             # If AWS fails, we'll use mock data
@@ -42,99 +255,158 @@ class AIPipelineAnalytics:
 
     def generate_mock_data(self, hours: int = 24) -> pd.DataFrame:
         """Generate mock data for demo purposes"""
-        import random
-        from datetime import datetime, timedelta
+        # Seeded per cache window rather than drawn from self.rng, so reruns agree;
+        # build_mock_data is the uncached path that uses self.rng
+        return _cached_mock_summary(self, hours, int(time.time() // CACHE_TTL_SECONDS))[0]
+
+    def generate_summary(self, hours: int = 24) -> Tuple[pd.DataFrame, Dict]:
+        """Pipeline logs together with their performance metrics"""
+        if not self.use_aws:
+            # Mock metrics come from the generation arrays; no second pass over the frame
+            return _cached_mock_summary(self, hours, int(time.time() // CACHE_TTL_SECONDS))
+        df = self.get_pipeline_logs(hours)
+        return df, self.calculate_performance_metrics(df)
+
+    def build_mock_data(self, hours: int, rng: np.random.Generator = None) -> pd.DataFrame:
+        """Draw a fresh mock dataset from the given random generator (the instance's by default)"""
+        return self.build_mock_summary(hours, rng)[0]
+
+    def build_mock_summary(
+        self, hours: int, rng: np.random.Generator = None
+    ) -> Tuple[pd.DataFrame, Dict]:
+        """Draw a fresh mock dataset and compute its metrics from the same arrays"""
+        if rng is None:
+            rng = self.rng
+        # Generate every column at once instead of row by row
+        num_records = int(rng.integers(50, 150, endpoint=True))
+        # Read the clock once; every timestamp is that instant minus a drawn offset
+        end_time = np.datetime64(datetime.now(), 'us')
+        offsets_us = (rng.random(num_records) * hours * 3600 * 1e6).astype('timedelta64[us]')
         
-        # Sample data for demonstration
-        sample_messages = [
-            "How do I implement a REST API in Python?",
-            "What's the difference between supervised and unsupervised learning?",
-            "Can you help me debug this SQL query?",
-            "Explain neural networks in simple terms",
-            "How to deploy a machine learning model?",
-            "What are the best practices for data preprocessing?",
-            "Help me understand Docker containers",
-            "How do I optimize database performance?",
-            "What's the latest in AI research?",
-            "Can you review my Python code?"
-        ]
+        message_idx = rng.integers(0, len(_SAMPLE_MESSAGES), num_records)
+        complexity_idx = rng.choice(len(COMPLEXITY_LEVELS), num_records, p=_COMPLEXITY_WEIGHTS)
         
-        complexities = ['low', 'medium', 'high']
-        statuses = ['SUCCESS', 'FAILED']
+        # Execution time based on complexity: gather each record's bin edges, then
+        # scale one uniform draw into them
+        low = _EXEC_TIME_LOWS[complexity_idx]
+        high = _EXEC_TIME_HIGHS[complexity_idx]
+        exec_time = (rng.random(num_records) * (high - low) + low).astype(np.int32)
         
-        # Generate random data
-        num_records = random.randint(50, 150)
-        end_time = datetime.now()
-        start_time = end_time - timedelta(hours=hours)
+        failed = rng.random(num_records) < 0.05
+        word_count = _MSG_WC[message_idx] + rng.integers(0, 20, num_records, endpoint=True)
+        has_code = rng.random(num_records) < 0.5
+        has_question = _MSG_HAS_Q[message_idx]
         
-        data = []
-        for i in range(num_records):
-            # Random timestamp within range
-            time_diff = random.random() * (end_time - start_time).total_seconds()
-            timestamp = start_time + timedelta(seconds=time_diff)
-            
-            # Random data
-            complexity = random.choice(complexities)
-            message = random.choice(sample_messages)
-            word_count = len(message.split()) + random.randint(0, 20)
-            
-            # Execution time based on complexity
-            if complexity == 'high':
-                exec_time = random.randint(2000, 5000)
-            elif complexity == 'medium':
-                exec_time = random.randint(1000, 3000)
-            else:
-                exec_time = random.randint(200, 1500)
-            
-            data.append({
-                'pipeline_id': f"pipeline_{i:04d}",
-                'timestamp': timestamp,
-                'user_message': message,
-                'complexity': complexity,
-                'word_count': word_count,
-                'has_code': random.choice([True, False]),
-                'has_question': '?' in message,
-                'execution_time_ms': exec_time,
-                'status': random.choices(statuses, weights=[95, 5])[0]
-            })
+        # Same KPIs as calculate_performance_metrics, reduced from the raw arrays
+        avg_execution_time = float(exec_time.mean())
+        metrics = {
+            'total_executions': num_records,
+            'success_rate': np.count_nonzero(~failed) / num_records * 100,
+            'avg_response_time': avg_execution_time,
+            'avg_execution_time': avg_execution_time,
+            'avg_word_count': float(word_count.mean()),
+            'complexity_distribution': _code_counts(complexity_idx, COMPLEXITY_LEVELS),
+            'code_requests_percentage': np.count_nonzero(has_code) / num_records * 100,
+            'question_percentage': np.count_nonzero(has_question) / num_records * 100
+        }
+        
+        # Columns are built directly in their final dtypes: codes become
+        # categoricals without factorizing strings, and no generic dtype pass
+        df = pd.DataFrame({
+            'pipeline_id': _arrow_array(
+                np.char.add('pipeline_', np.char.zfill(np.arange(num_records).astype(str), 4))
+            ),
+            'timestamp': end_time - offsets_us,
+            'user_message': _arrow_array(_SAMPLE_MESSAGES[message_idx]),
+            'complexity': pd.Categorical.from_codes(complexity_idx, dtype=_COMPLEXITY_DTYPE),
+            'word_count': _arrow_array(word_count, pa.int16()),
+            'has_code': has_code,
+            'has_question': has_question,
+            'execution_time_ms': _arrow_array(exec_time, pa.int32()),
+            'status': pd.Categorical.from_codes(failed.astype(np.int8), categories=_MOCK_STATUSES)
+        })
+        return df, metrics
+
+    def query_log_items(self, table, start_iso: str, end_iso: str) -> List[Dict]:
+        """Read log items inside the time window from the ByTime index"""
+        query_kwargs = {
+            'IndexName': 'ByTime',
+            'KeyConditionExpression': (
+                Key('pk').eq('log') & Key('timestamp').between(start_iso, end_iso)
+            ),
+            'Select': 'SPECIFIC_ATTRIBUTES',
+            'ProjectionExpression': LOG_ITEM_PROJECTION,
+            'ExpressionAttributeNames': LOG_ITEM_ATTRIBUTE_NAMES
+        }
+        
+        items = []
+        while True:
+            response = table.query(**query_kwargs)
+            items.extend(response['Items'])
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        return items
+
+    def scan_log_items(self, table_name: str, start_iso: str, end_iso: str) -> Iterator[Dict]:
+        """Stream log items inside the time window with a server-side filtered scan"""
+        paginator = self.dynamodb.meta.client.get_paginator('scan')
+        pages = paginator.paginate(
+            TableName=table_name,
+            FilterExpression='#ts BETWEEN :s AND :e',
+            Select='SPECIFIC_ATTRIBUTES',
+            ProjectionExpression=LOG_ITEM_PROJECTION,
+            ExpressionAttributeNames=LOG_ITEM_ATTRIBUTE_NAMES,
+            ExpressionAttributeValues={':s': start_iso, ':e': end_iso},
+            PaginationConfig={'PageSize': 1000}
+        )
+        return chain.from_iterable(page['Items'] for page in pages)
+
+    def logs_to_dataframe(self, items: Iterable[Dict]) -> pd.DataFrame:
+        """Build the dashboard DataFrame from raw DynamoDB log items"""
+        # Arrow converts straight from the item dicts; flatten() splits the analysis
+        # struct into analysis.<field> columns without a Python pass over the items
+        table = _log_items_table(list(items)).flatten()
+        if table.num_rows == 0:
+            return pd.DataFrame()
+        raw = _arrow_to_pandas(table)
         
-        return pd.DataFrame(data)
+        # Items with unparseable timestamps are dropped, as before
+        timestamps = pd.to_datetime(raw['timestamp'], utc=True, format='ISO8601', errors='coerce')
+        raw = raw[timestamps.notna()].assign(timestamp=timestamps)
+        
+        df = (
+            raw.rename(columns={f'analysis.{field}': field for field in ANALYSIS_DEFAULTS})
+            .fillna({**ANALYSIS_DEFAULTS, 'execution_time_ms': 0, 'status': 'UNKNOWN'})
+            .reset_index(drop=True)
+        )
+        return _apply_column_dtypes(df)
 
     def get_pipeline_logs(self, hours: int = 24) -> pd.DataFrame:
         """Fetch pipeline execution logs from DynamoDB or generate mock data"""
         if not self.use_aws:
             return self.generate_mock_data(hours)
-            
+        return _cached_pipeline_logs(self, hours, int(time.time() // CACHE_TTL_SECONDS))
+
+    def fetch_pipeline_logs(self, hours: int = 24) -> pd.DataFrame:
+        """Read pipeline execution logs from DynamoDB, bypassing the cache"""
         try:
             table = self.dynamodb.Table('PipelineLogs')
             
             # Calculate time range
             end_time = datetime.now()
             start_time = end_time - timedelta(hours=hours)
+            start_iso, end_iso = start_time.isoformat(), end_time.isoformat()
             
-            # Scan table with time filter
-            response = table.scan()
-            
-            logs = []
-            for item in response['Items']:
-                try:
-                    timestamp = datetime.fromisoformat(item['timestamp'].replace('Z', '+00:00'))
-                    if start_time <= timestamp <= end_time:
-                        logs.append({
-                            'pipeline_id': item['pipeline_id'],
-                            'timestamp': timestamp,
-                            'user_message': item['user_message'],
-                            'complexity': item.get('analysis', {}).get('complexity', 'unknown'),
-                            'word_count': item.get('analysis', {}).get('word_count', 0),
-                            'has_code': item.get('analysis', {}).get('has_code', False),
-                            'has_question': item.get('analysis', {}).get('has_question', False),
-                            'execution_time_ms': item.get('execution_time_ms', 0),
-                            'status': item.get('status', 'UNKNOWN')
-                        })
-                except Exception as e:
-                    continue
+            try:
+                items = self.query_log_items(table, start_iso, end_iso)
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ValidationException':
+                    raise
+                # Table has no ByTime index yet, fall back to a filtered scan
+                items = self.scan_log_items('PipelineLogs', start_iso, end_iso)
             
-            df = pd.DataFrame(logs)
+            df = self.logs_to_dataframe(items)
             if df.empty:
                 st.info("No data found in DynamoDB. Generating mock data for demonstration.")
                 return self.generate_mock_data(hours)
@@ -145,33 +417,44 @@ class AIPipelineAnalytics:
 
     def generate_mock_cloudwatch_metrics(self) -> Dict:
         """Generate mock CloudWatch metrics for demo"""
-        import random
-        from datetime import datetime, timedelta
-        
+        # Reuse this instance's last build within the same cache window
+        bucket = int(time.time() // CACHE_TTL_SECONDS)
+        if self._cw_cache is None or self._cw_cache[0] != bucket:
+            self._cw_cache = (bucket, self.build_mock_cloudwatch_metrics())
+        return dict(self._cw_cache[1])
+    
+    def build_mock_cloudwatch_metrics(self) -> Dict:
+        """Draw a fresh set of mock CloudWatch metrics"""
         metrics = {}
-        lambda_functions = ['InputAnalyzerFunction', 'ResponseEnhancerFunction', 'PipelineLoggerFunction']
         
-        # Generate mock Lambda metrics
-        for function in lambda_functions:
-            datapoints = []
-            for i in range(24):  # 24 hours of data
-                timestamp = datetime.now() - timedelta(hours=23-i)
-                datapoints.append({
-                    'Timestamp': timestamp,
-                    'Average': random.randint(500, 2000),
-                    'Maximum': random.randint(2000, 5000),
-                    'Minimum': random.randint(100, 500)
-                })
-            metrics[function] = datapoints
+        # 24 hourly timestamps, oldest first, stamped in one vectorized call
+        hourly = pd.date_range(
+            end=datetime.now(), periods=24, freq=pd.Timedelta(hours=1)
+        ).to_pydatetime().tolist()
+        
+        # Generate mock Lambda metrics: Average/Maximum/Minimum for every
+        # function and hour in a single draw
+        lambda_stats = self.rng.integers(
+            [500, 2000, 100], [2000, 5000, 500], (len(LAMBDA_FUNCTIONS), 24, 3), endpoint=True
+        ).tolist()
+        for function, rows in zip(LAMBDA_FUNCTIONS, lambda_stats):
+            metrics[function] = [
+                {'Timestamp': timestamp, 'Average': average, 'Maximum': maximum, 'Minimum': minimum}
+                for timestamp, (average, maximum, minimum) in zip(hourly, rows)
+            ]
         
-        # Mock execution metrics
+        # Mock execution metrics, newest first
+        newest_first = hourly[::-1]
+        execution_sums = self.rng.integers(
+            [[10], [0]], [[50], [3]], (2, 24), endpoint=True
+        ).tolist()
         metrics['executions_succeeded'] = [
-            {'Timestamp': datetime.now() - timedelta(hours=i), 'Sum': random.randint(10, 50)}
-            for i in range(24)
+            {'Timestamp': timestamp, 'Sum': total}
+            for timestamp, total in zip(newest_first, execution_sums[0])
         ]
         metrics['executions_failed'] = [
-            {'Timestamp': datetime.now() - timedelta(hours=i), 'Sum': random.randint(0, 3)}
-            for i in range(24)
+            {'Timestamp': timestamp, 'Sum': total}
+            for timestamp, total in zip(newest_first, execution_sums[1])
         ]
         
         return metrics
@@ -180,101 +463,106 @@ class AIPipelineAnalytics:
         """Fetch CloudWatch metrics for pipeline performance"""
         if not self.use_aws:
             return self.generate_mock_cloudwatch_metrics()
-            
+        return _cached_cloudwatch_metrics(self, hours, int(time.time() // CACHE_TTL_SECONDS))
+
+    def fetch_cloudwatch_metrics(self, hours: int = 24) -> Dict:
+        """Read CloudWatch metrics for pipeline performance, bypassing the cache"""
         try:
             end_time = datetime.now()
             start_time = end_time - timedelta(hours=hours)
             
-            metrics = {}
-            
-            # Lambda function metrics
-            lambda_functions = ['InputAnalyzerFunction', 'ResponseEnhancerFunction', 'PipelineLoggerFunction']
+            # (metrics key, namespace, metric name, dimensions, statistics)
+            metric_specs = [
+                (function, 'AWS/Lambda', 'Duration',
+                 [{'Name': 'FunctionName', 'Value': function}], ['Average', 'Maximum', 'Minimum'])
+                for function in LAMBDA_FUNCTIONS
+            ] + [
+                ('executions_succeeded', 'AWS/StepFunctions', 'ExecutionsSucceeded', [], ['Sum']),
+                ('executions_failed', 'AWS/StepFunctions', 'ExecutionsFailed', [], ['Sum'])
+            ]
             
-            for function in lambda_functions:
-                response = self.cloudwatch.get_metric_statistics(
-                    Namespace='AWS/Lambda',
-                    MetricName='Duration',
-                    Dimensions=[{'Name': 'FunctionName', 'Value': function}],
-                    StartTime=start_time,
-                    EndTime=end_time,
-                    Period=3600,  # 1 hour intervals
-                    Statistics=['Average', 'Maximum', 'Minimum']
-                )
-                metrics[function] = response['Datapoints']
-            
-            # Step Functions metrics
-            response = self.cloudwatch.get_metric_statistics(
-                Namespace='AWS/StepFunctions',
-                MetricName='ExecutionsSucceeded',
-                StartTime=start_time,
-                EndTime=end_time,
-                Period=3600,
-                Statistics=['Sum']
-            )
-            metrics['executions_succeeded'] = response['Datapoints']
+            # Batch every series into a single GetMetricData request
+            queries = []
+            query_targets = {}
+            for i, (key, namespace, metric_name, dimensions, statistics) in enumerate(metric_specs):
+                for stat in statistics:
+                    query_id = f"m{i}_{stat.lower()}"
+                    query_targets[query_id] = (key, stat)
+                    queries.append({
+                        'Id': query_id,
+                        'MetricStat': {
+                            'Metric': {
+                                'Namespace': namespace,
+                                'MetricName': metric_name,
+                                'Dimensions': dimensions
+                            },
+                            'Period': 3600,  # 1 hour intervals
+                            'Stat': stat
+                        }
+                    })
             
-            response = self.cloudwatch.get_metric_statistics(
-                Namespace='AWS/StepFunctions',
-                MetricName='ExecutionsFailed',
-                StartTime=start_time,
-                EndTime=end_time,
-                Period=3600,
-                Statistics=['Sum']
-            )
-            metrics['executions_failed'] = response['Datapoints']
+            # Merge per-statistic series back into get_metric_statistics style datapoints
+            datapoints = {key: {} for key, *_ in metric_specs}
+            request_kwargs = {
+                'MetricDataQueries': queries, 'StartTime': start_time, 'EndTime': end_time
+            }
+            while True:
+                response = self.cloudwatch.get_metric_data(**request_kwargs)
+                for result in response['MetricDataResults']:
+                    key, stat = query_targets[result['Id']]
+                    for timestamp, value in zip(result['Timestamps'], result['Values']):
+                        point = datapoints[key].setdefault(timestamp, {'Timestamp': timestamp})
+                        point[stat] = value
+                if 'NextToken' not in response:
+                    break
+                request_kwargs['NextToken'] = response['NextToken']
             
-            return metrics
+            return {key: list(points.values()) for key, points in datapoints.items()}
         except Exception as e:
             st.warning(f"Error fetching CloudWatch metrics: {str(e)}. Using mock data.")
             return self.generate_mock_cloudwatch_metrics()
 
     def calculate_performance_metrics(self, df: pd.DataFrame) -> Dict:
         """Calculate key performance indicators"""
+        # Nothing to reduce: answer before touching any column
         if df.empty:
-            return {
-                'total_executions': 0,
-                'success_rate': 0,
-                'avg_response_time': 0,
-                'avg_word_count': 0,
-                'complexity_distribution': {},
-                'code_requests_percentage': 0,
-                'question_percentage': 0
-            }
+            return _empty_metrics()
         
         try:
             total_executions = len(df)
             
-            # Safe calculation with error handling
+            # Safe calculation with error handling; counts are NumPy reductions
+            # over the raw column arrays rather than filtered DataFrame copies
             if 'status' in df.columns:
-                success_rate = len(df[df['status'] == 'SUCCESS']) / total_executions * 100
+                successes = np.count_nonzero(_equals(df['status'], 'SUCCESS'))
+                success_rate = successes / total_executions * 100
             else:
                 success_rate = 0
                 
             if 'execution_time_ms' in df.columns:
-                # Convert to numeric, handling invalid values
-                execution_times = pd.to_numeric(df['execution_time_ms'], errors='coerce')
-                avg_execution_time = execution_times.mean() if not execution_times.isna().all() else 0
+                avg_execution_time = _numeric_mean(df['execution_time_ms'])
             else:
                 avg_execution_time = 0
                 
             if 'complexity' in df.columns:
-                complexity_distribution = df['complexity'].value_counts().to_dict()
+                complexity_distribution = _value_counts(df['complexity'])
             else:
                 complexity_distribution = {}
                 
             if 'word_count' in df.columns:
-                word_counts = pd.to_numeric(df['word_count'], errors='coerce')
-                avg_word_count = word_counts.mean() if not word_counts.isna().all() else 0
+                avg_word_count = _numeric_mean(df['word_count'])
             else:
                 avg_word_count = 0
                 
             if 'has_code' in df.columns:
-                code_requests_percentage = len(df[df['has_code'] == True]) / total_executions * 100
+                code_requests = (df['has_code'].to_numpy() == True).sum()
+                code_requests_percentage = code_requests / total_executions * 100
             else:
                 code_requests_percentage = 0
                 
             if 'has_question' in df.columns:
-                question_percentage = len(df[df['has_question'] == True]) / total_executions * 100
+                questions = (df['has_question'].to_numpy() == True).sum()
+                question_percentage = questions / total_executions * 100
             else:
                 question_percentage = 0
             
@@ -291,15 +579,89 @@ class AIPipelineAnalytics:
             
         except Exception as e:
             # Return safe defaults if calculation fails
-            return {
-                'total_executions': len(df) if not df.empty else 0,
-                'success_rate': 0,
-                'avg_response_time': 0,
-                'avg_word_count': 0,
-                'complexity_distribution': {},
-                'code_requests_percentage': 0,
-                'question_percentage': 0
-            }
+            metrics = _empty_metrics()
+            metrics['total_executions'] = len(df)
+            return metrics
+
+@st.cache_resource(show_spinner=False)
+def _aws_session() -> boto3.session.Session:
+    """One boto3 session, so credentials, endpoints and service models resolve only once"""
+    return boto3.session.Session(region_name='us-east-2')
+
+@st.cache_resource(show_spinner=False)
+def _aws_clients() -> SimpleNamespace:
+    """AWS clients shared by every session; a failed setup raises and is not cached"""
+    session = _aws_session()
+    clients = SimpleNamespace(
+        dynamodb=session.resource('dynamodb', config=AWS_CLIENT_CONFIG),
+        cloudwatch=session.client('cloudwatch', config=AWS_CLIENT_CONFIG),
+        stepfunctions=session.client('stepfunctions', config=AWS_CLIENT_CONFIG),
+        logs=session.client('logs', config=AWS_CLIENT_CONFIG)
+    )
+    
+    # Test AWS connection
+    session.client('sts', config=AWS_CLIENT_CONFIG).get_caller_identity()
+    return clients
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def _cached_mock_summary(
+    _analytics: AIPipelineAnalytics, hours: int, seed_bucket: int
+) -> Tuple[pd.DataFrame, Dict]:
+    """Mock data and metrics seeded by time bucket and window, stable across reruns in a bucket"""
+    return _analytics.build_mock_summary(hours, np.random.default_rng([seed_bucket, hours]))
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def _cached_pipeline_logs(
+    _analytics: AIPipelineAnalytics, hours: int, bucket_key: int
+) -> pd.DataFrame:
+    """Pipeline logs cached per time window; bucket_key rolls over every CACHE_TTL_SECONDS"""
+    return _analytics.fetch_pipeline_logs(hours)
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def _cached_cloudwatch_metrics(
+    _analytics: AIPipelineAnalytics, hours: int, bucket_key: int
+) -> Dict:
+    """CloudWatch metrics cached per time window; bucket_key rolls over every CACHE_TTL_SECONDS"""
+    return _analytics.fetch_cloudwatch_metrics(hours)
+
+# Figures are rebuilt only when the plotted columns change; Streamlit hashes the
+# column subsets passed in, so reruns on the same data skip Plotly (and the OLS fit)
+@st.cache_data(show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def _timeline_figure(timeline_df: pd.DataFrame) -> go.Figure:
+    """Execution timeline histogram coloured by complexity"""
+    fig = px.histogram(
+        timeline_df,
+        x='timestamp',
+        color='complexity',
+        title="Pipeline Executions Over Time",
+        nbins=20
+    )
+    fig.update_layout(height=400)
+    return fig
+
+@st.cache_data(show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def _response_time_figure(response_df: pd.DataFrame) -> go.Figure:
+    """Response time histogram"""
+    fig = px.histogram(
+        response_df,
+        x='execution_time_ms',
+        title="Response Time Distribution",
+        nbins=15
+    )
+    fig.update_xaxes(title="Response Time (ms)")
+    return fig
+
+@st.cache_data(show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def _correlation_figure(correlation_df: pd.DataFrame) -> go.Figure:
+    """Word count vs response time scatter, with an OLS trendline when statsmodels is present"""
+    return px.scatter(
+        correlation_df,
+        x='word_count',
+        y='execution_time_ms',
+        color='complexity',
+        title="Word Count vs Response Time Correlation",
+        trendline="ols" if _HAS_STATSMODELS else None
+    )
 
 def main():
     st.title("🚀 AI Pipeline Analytics Dashboard")
@@ -320,14 +682,13 @@ def main():
     auto_refresh = st.sidebar.checkbox("Auto-refresh (30s)", value=False)
     
     if auto_refresh:
-        time.sleep(30)
-        st.rerun()
+        # Client-side timer triggers the rerun, so the server thread is never parked in sleep
+        st_autorefresh(interval=CACHE_TTL_SECONDS * 1000, key='dash_refresh')
     
     # Fetch data
     with st.spinner("Loading pipeline data..."):
-        df = analytics.get_pipeline_logs(hours=time_range)
+        df, performance_metrics = analytics.generate_summary(hours=time_range)
         cloudwatch_metrics = analytics.get_cloudwatch_metrics(hours=time_range)
-        performance_metrics = analytics.calculate_performance_metrics(df)
     
     # Main metrics row
     if performance_metrics:
@@ -365,14 +726,7 @@ def main():
     if not df.empty:
         # Execution timeline
         st.subheader("📈 Execution Timeline")
-        fig_timeline = px.histogram(
-            df,
-            x='timestamp',
-            color='complexity',
-            title="Pipeline Executions Over Time",
-            nbins=20
-        )
-        fig_timeline.update_layout(height=400)
+        fig_timeline = _timeline_figure(df[['timestamp', 'complexity']])
         st.plotly_chart(fig_timeline, use_container_width=True)
         
         # Performance metrics
@@ -395,13 +749,7 @@ def main():
         
         with col2:
             st.subheader("⚡ Response Time Distribution")
-            fig_response_time = px.histogram(
-                df,
-                x='execution_time_ms',
-                title="Response Time Distribution",
-                nbins=15
-            )
-            fig_response_time.update_xaxes(title="Response Time (ms)")
+            fig_response_time = _response_time_figure(df[['execution_time_ms']])
             st.plotly_chart(fig_response_time, use_container_width=True)
         
         # Advanced analytics
@@ -431,25 +779,9 @@ def main():
         with col2:
             # Performance correlation
             if len(df) > 1:
-                try:
-                    # Try to create scatter plot with trendline (requires statsmodels)
-                    fig_correlation = px.scatter(
-                        df,
-                        x='word_count',
-                        y='execution_time_ms',
-                        color='complexity',
-                        title="Word Count vs Response Time Correlation",
-                        trendline="ols"
-                    )
-                except ImportError:
-                    # Fallback: scatter plot without trendline
-                    fig_correlation = px.scatter(
-                        df,
-                        x='word_count',
-                        y='execution_time_ms',
-                        color='complexity',
-                        title="Word Count vs Response Time Correlation"
-                    )
+                fig_correlation = _correlation_figure(
+                    df[['word_count', 'execution_time_ms', 'complexity']]
+                )
                 st.plotly_chart(fig_correlation, use_container_width=True)
     
     # Real-time monitoring section
@@ -457,18 +789,19 @@ def main():
     
     if cloudwatch_metrics:
         # Lambda performance
-        lambda_metrics_df = []
-        for function, datapoints in cloudwatch_metrics.items():
-            if function.endswith('Function') and datapoints:
-                for point in datapoints:
-                    lambda_metrics_df.append({
-                        'Function': function.replace('Function', ''),
-                        'Timestamp': point['Timestamp'],
-                        'Duration': point['Average']
-                    })
+        # One columnar frame per function rather than a dict per datapoint
+        lambda_frames = [
+            pd.DataFrame({
+                'Function': function.replace('Function', ''),
+                'Timestamp': [point['Timestamp'] for point in datapoints],
+                'Duration': [point['Average'] for point in datapoints]
+            })
+            for function, datapoints in cloudwatch_metrics.items()
+            if function.endswith('Function') and datapoints
+        ]
         
-        if lambda_metrics_df:
-            lambda_df = pd.DataFrame(lambda_metrics_df)
+        if lambda_frames:
+            lambda_df = pd.concat(lambda_frames, ignore_index=True)
             fig_lambda = px.line(
                 lambda_df,
                 x='Timestamp',
@@ -482,11 +815,11 @@ def main():
     # Recent executions table
     st.subheader("📋 Recent Executions")
     if not df.empty:
-        recent_df = df.sort_values('timestamp', ascending=False).head(10)
-        st.dataframe(
-            recent_df[['timestamp', 'user_message', 'complexity', 'execution_time_ms', 'status']],
-            use_container_width=True
-        )
+        # Top-10 selection instead of sorting the whole frame
+        recent_df = df.nlargest(10, 'timestamp')[
+            ['timestamp', 'user_message', 'complexity', 'execution_time_ms', 'status']
+        ]
+        st.dataframe(recent_df, use_container_width=True)
     
     # System alerts
     st.subheader("🚨 System Alerts")
@@ -4,29 +4,22 @@ Comprehensive Test Coverage Report Generator
 Generates detailed coverage reports with metrics and analysis
 """
 
-import subprocess
 import sys
 import os
 import json
-import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from importlib.util import find_spec
 from pathlib import Path
 
-def run_command(command, capture_output=True):
-    """Run a command and return the result"""
-    try:
-        result = subprocess.run(
-            command, 
-            shell=True, 
-            capture_output=capture_output, 
-            text=True, 
-            check=True
-        )
-        return result.stdout if capture_output else None
-    except subprocess.CalledProcessError as e:
-        print(f"Error running command: {command}")
-        print(f"Error: {e}")
-        return None
+from script_utils import count_lines_safe, run_pytest
+
+# lxml parses in C; the stdlib parser offers the same iterparse API as a fallback
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
 
 def generate_coverage_report():
     """Generate comprehensive test coverage report"""
@@ -36,18 +29,20 @@ def generate_coverage_report():
     # Run tests with coverage
     print("📊 Running tests with coverage analysis...")
     
-    coverage_cmd = (
-        "python -m pytest tests/ -v "
-        "--cov=analytics_dashboard "
-        "--cov-report=html:htmlcov "
-        "--cov-report=xml:coverage.xml "
-        "--cov-report=json:coverage.json "
-        "--cov-report=term-missing "
-        "--cov-fail-under=80"
-    )
+    coverage_args = [
+        'tests/', '-v',
+        '--cov=analytics_dashboard',
+        '--cov-report=html:htmlcov',
+        '--cov-report=xml:coverage.xml',
+        '--cov-report=json:coverage.json',
+        '--cov-report=term-missing',
+        '--cov-fail-under=80'
+    ]
     
-    print(f"Running: {coverage_cmd}")
-    result = run_command(coverage_cmd, capture_output=False)
+    print(f"Running: pytest {' '.join(coverage_args)}")
+    # The performance pass runs pytest again later, so keep this one out of
+    # process; a second pytest.main would reuse already-imported modules
+    run_pytest(coverage_args, in_process=False)
     
     # Parse coverage results
     print("\n📈 Parsing coverage results...")
@@ -63,6 +58,8 @@ def generate_coverage_report():
     
     print("\n✅ Coverage report generation complete!")
     print(f"📁 Reports available in: htmlcov/index.html")
+    
+    return coverage_data
 
 def parse_coverage_results():
     """Parse coverage results from multiple formats"""
@@ -76,39 +73,9 @@ def parse_coverage_results():
     # Parse XML coverage report
     if os.path.exists('coverage.xml'):
         try:
-            tree = ET.parse('coverage.xml')
-            root = tree.getroot()
-            
-            # Get overall coverage
-            coverage_data['summary'] = {
-                'line_rate': float(root.get('line-rate', 0)) * 100,
-                'branch_rate': float(root.get('branch-rate', 0)) * 100,
-                'lines_covered': int(root.get('lines-covered', 0)),
-                'lines_valid': int(root.get('lines-valid', 0)),
-                'branches_covered': int(root.get('branches-covered', 0)),
-                'branches_valid': int(root.get('branches-valid', 0))
-            }
-            
-            # Get file-level coverage
-            for package in root.findall('.//package'):
-                for class_elem in package.findall('classes/class'):
-                    filename = class_elem.get('filename', '')
-                    if filename.endswith('.py'):
-                        lines = class_elem.findall('lines/line')
-                        covered_lines = sum(1 for line in lines if int(line.get('hits', 0)) > 0)
-                        total_lines = len(lines)
-                        
-                        coverage_data['files'][filename] = {
-                            'line_rate': (covered_lines / total_lines * 100) if total_lines > 0 else 0,
-                            'lines_covered': covered_lines,
-                            'lines_total': total_lines,
-                            'missing_lines': [
-                                int(line.get('number')) 
-                                for line in lines 
-                                if int(line.get('hits', 0)) == 0
-                            ]
-                        }
-                        
+            coverage_data['summary'], coverage_data['files'] = _load_coverage_xml(
+                'coverage.xml', os.path.getmtime('coverage.xml')
+            )
         except Exception as e:
             print(f"Error parsing XML coverage: {e}")
     
@@ -123,6 +90,54 @@ def parse_coverage_results():
     
     return coverage_data
 
+def parse_coverage_xml(path):
+    """Stream a Cobertura XML report into (summary, per-file coverage)"""
+    context = ET.iterparse(path, events=('start', 'end'))
+    
+    # Get overall coverage from the root element's attributes
+    _, root = next(context)
+    summary = {
+        'line_rate': float(root.get('line-rate', 0)) * 100,
+        'branch_rate': float(root.get('branch-rate', 0)) * 100,
+        'lines_covered': int(root.get('lines-covered', 0)),
+        'lines_valid': int(root.get('lines-valid', 0)),
+        'branches_covered': int(root.get('branches-covered', 0)),
+        'branches_valid': int(root.get('branches-valid', 0))
+    }
+    
+    # Get file-level coverage, one <class> at a time
+    files = {}
+    for event, class_elem in context:
+        if event != 'end' or class_elem.tag != 'class':
+            continue
+        
+        filename = class_elem.get('filename', '')
+        if filename.endswith('.py'):
+            hits = [
+                (int(line.get('number')), int(line.get('hits', 0)))
+                for line in class_elem.iterfind('lines/line')
+            ]
+            missing_lines = [number for number, line_hits in hits if line_hits == 0]
+            total_lines = len(hits)
+            covered_lines = total_lines - len(missing_lines)
+            
+            files[filename] = {
+                'line_rate': (covered_lines / total_lines * 100) if total_lines > 0 else 0,
+                'lines_covered': covered_lines,
+                'lines_total': total_lines,
+                'missing_lines': missing_lines
+            }
+        
+        # Drop the parsed subtree so the whole document is never held in memory
+        class_elem.clear()
+    
+    return summary, files
+
+@lru_cache(maxsize=4)
+def _load_coverage_xml(path, mtime):
+    """Parse a coverage XML once per modification time; mtime is only the cache key"""
+    return parse_coverage_xml(path)
+
 def generate_detailed_report(coverage_data):
     """Generate a detailed coverage report in markdown format"""
     report_content = f"""# Test Coverage Report
@@ -198,12 +213,12 @@ Generated: {coverage_data['timestamp']}
 
 def run_performance_tests():
     """Run performance benchmark tests"""
-    perf_cmd = "python -m pytest tests/test_performance.py -v -s --tb=short"
+    perf_args = ['tests/test_performance.py', '-v', '-s', '--tb=short']
     
-    print(f"Running: {perf_cmd}")
-    result = run_command(perf_cmd, capture_output=False)
+    print(f"Running: pytest {' '.join(perf_args)}")
+    rc = run_pytest(perf_args)
     
-    if result is not None:
+    if rc == 0:
         print("✅ Performance tests completed")
     else:
         print("⚠️ Performance tests had issues")
@@ -216,25 +231,16 @@ def analyze_test_results():
     test_files = list(Path('tests').glob('test_*.py'))
     total_test_files = len(test_files)
     
-    # Get line counts
-    total_test_lines = 0
-    for test_file in test_files:
-        try:
-            with open(test_file, 'r') as f:
-                total_test_lines += len(f.readlines())
-        except Exception:
-            pass
+    # Get line counts; reads are I/O bound, so overlap them across threads
+    with ThreadPoolExecutor() as executor:
+        total_test_lines = sum(lines for _, lines in executor.map(count_lines_safe, test_files))
     
     # Get source line counts
     source_files = ['analytics_dashboard.py', 'run_demo_dashboard.py']
     total_source_lines = 0
     for source_file in source_files:
         if os.path.exists(source_file):
-            try:
-                with open(source_file, 'r') as f:
-                    total_source_lines += len(f.readlines())
-            except Exception:
-                pass
+            total_source_lines += count_lines_safe(source_file)[1]
     
     # Calculate ratios
     test_to_code_ratio = (total_test_lines / total_source_lines) if total_source_lines > 0 else 0
@@ -250,13 +256,11 @@ def analyze_test_results():
     else:
         print("   ⚠️ Consider adding more tests")
 
-def generate_badge_info():
-    """Generate coverage badge information"""
-    if os.path.exists('coverage.xml'):
+def generate_badge_info(coverage_data):
+    """Generate coverage badge information from already parsed coverage data"""
+    if 'line_rate' in coverage_data['summary']:
         try:
-            tree = ET.parse('coverage.xml')
-            root = tree.getroot()
-            coverage = float(root.get('line-rate', 0)) * 100
+            coverage = coverage_data['summary']['line_rate']
             
             # Determine badge color
             if coverage >= 90:
@@ -289,19 +293,19 @@ def main():
         sys.exit(1)
     
     # Check if pytest is available
-    if run_command("python -m pytest --version") is None:
+    if find_spec('pytest') is None:
         print("❌ Error: pytest not found")
         print("Please install pytest: pip install pytest pytest-cov")
         sys.exit(1)
     
     # Generate coverage report
-    generate_coverage_report()
+    coverage_data = generate_coverage_report()
     
     # Analyze results
     analyze_test_results()
     
     # Generate badge info
-    generate_badge_info()
+    generate_badge_info(coverage_data)
     
     print("\n🎉 Coverage analysis complete!")
     print("📁 Check the following files:")
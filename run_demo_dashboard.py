@@ -9,7 +9,16 @@ import sys
 import subprocess
 import json
 from datetime import datetime, timedelta
-import random
+
+import numpy as np
+
+from script_utils import reqs_cached, reqs_fingerprint, save_reqs_marker
+
+# orjson is optional; the stdlib json module produces the same file, only slower
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 def generate_sample_data():
     """Generate sample data for local testing"""
@@ -42,62 +51,80 @@ def generate_sample_data():
     }
     
     # Generate sample pipeline logs
-    logs = []
+    num_records = 150  # Generate 150 sample records
     end_time = datetime.now()
     start_time = end_time - timedelta(days=7)  # 7 days of data
+    span_seconds = (end_time - start_time).total_seconds()
     
-    for i in range(150):  # Generate 150 sample records
-        # Random timestamp
-        time_diff = random.random() * (end_time - start_time).total_seconds()
-        timestamp = start_time + timedelta(seconds=time_diff)
-        
-        # Choose complexity and message
-        complexity = random.choices(['low', 'medium', 'high'], weights=[50, 35, 15])[0]
-        message = random.choice(sample_messages[complexity])
-        
-        # Generate realistic metrics based on complexity
-        word_count = len(message.split())
-        if complexity == 'high':
-            exec_time = random.randint(2000, 6000)
-        elif complexity == 'medium':
-            exec_time = random.randint(800, 2500)
-        else:
-            exec_time = random.randint(200, 1200)
-        
-        # Occasional failures (5% failure rate)
-        status = 'FAILED' if random.random() < 0.05 else 'SUCCESS'
-        
+    complexities = ['low', 'medium', 'high']
+    error_messages = [
+        'Timeout exceeded',
+        'Service temporarily unavailable', 
+        'Rate limit exceeded',
+        'Invalid input format'
+    ]
+    
+    # Draw every numeric column at once; indices 0/1/2 map to low/medium/high
+    rng = np.random.default_rng()
+    complexity_idx = rng.choice(3, size=num_records, p=[0.50, 0.35, 0.15])
+    ts_offsets = rng.random(num_records) * span_seconds
+    # Real datetimes, serialized natively by orjson (isoformat in the stdlib fallback)
+    timestamps = (
+        np.datetime64(start_time, 'us') + (ts_offsets * 1e6).astype('timedelta64[us]')
+    ).astype(object)
+    message_counts = np.array([len(sample_messages[level]) for level in complexities])
+    message_idx = (rng.random(num_records) * message_counts[complexity_idx]).astype(int)
+    
+    # Generate realistic metrics based on complexity
+    exec_times = rng.integers(
+        np.array([200, 800, 2000])[complexity_idx],
+        np.array([1200, 2500, 6000])[complexity_idx],
+        endpoint=True
+    )
+    
+    # Occasional failures (5% failure rate)
+    failed = rng.random(num_records) < 0.05
+    error_idx = rng.integers(0, len(error_messages), num_records)
+    
+    # Message features only depend on the message text, so work them out once
+    # per canonical message rather than once per record
+    msg_features = {
+        message: {
+            'word_count': len(message.split()),
+            'has_code': '```' in message or 'def ' in message or 'function' in message,
+            'has_question': '?' in message or message.startswith(('What', 'How', 'Why', 'Can'))
+        }
+        for messages in sample_messages.values() for message in messages
+    }
+    
+    def build_log_entry(i):
+        complexity = complexities[complexity_idx[i]]
+        message = sample_messages[complexity][message_idx[i]]
         log_entry = {
             'pipeline_id': f"demo_pipeline_{i:04d}",
-            'timestamp': timestamp.isoformat(),
+            'timestamp': timestamps[i],
             'user_message': message,
-            'analysis': {
-                'complexity': complexity,
-                'word_count': word_count,
-                'has_code': '```' in message or 'def ' in message or 'function' in message,
-                'has_question': '?' in message or message.startswith(('What', 'How', 'Why', 'Can'))
-            },
-            'execution_time_ms': exec_time,
-            'status': status
+            'analysis': {'complexity': complexity, **msg_features[message]},
+            'execution_time_ms': int(exec_times[i]),
+            'status': 'FAILED' if failed[i] else 'SUCCESS'
         }
         
-        if status == 'FAILED':
-            log_entry['error_details'] = random.choice([
-                'Timeout exceeded',
-                'Service temporarily unavailable', 
-                'Rate limit exceeded',
-                'Invalid input format'
-            ])
+        if failed[i]:
+            log_entry['error_details'] = error_messages[error_idx[i]]
         
-        logs.append(log_entry)
+        return log_entry
     
-    # Sort by timestamp
-    logs.sort(key=lambda x: x['timestamp'])
+    # Dicts are only built at the end, already ordered by timestamp
+    logs = [build_log_entry(i) for i in ts_offsets.argsort()]
     
     # Save to local file for potential use
     os.makedirs('logs', exist_ok=True)
-    with open('logs/sample_pipeline_logs.json', 'w') as f:
-        json.dump(logs, f, indent=2, default=str)
+    if orjson is not None:
+        with open('logs/sample_pipeline_logs.json', 'wb') as f:
+            f.write(orjson.dumps(logs, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open('logs/sample_pipeline_logs.json', 'w') as f:
+            json.dump(logs, f, indent=2, default=lambda value: value.isoformat())
     
     print(f"✅ Generated {len(logs)} sample records")
     return logs
@@ -107,6 +134,11 @@ def check_requirements():
     required_packages = ['streamlit', 'plotly', 'pandas', 'boto3']
     missing_packages = []
     
+    # A recent successful probe in this same environment is good enough
+    fingerprint = reqs_fingerprint()
+    if reqs_cached(required_packages, fingerprint):
+        return True
+    
     for package in required_packages:
         try:
             __import__(package)
@@ -121,6 +153,7 @@ def check_requirements():
         print(f"   pip install {' '.join(missing_packages)}")
         return False
     
+    save_reqs_marker(required_packages, fingerprint)
     return True
 
 def main():
@@ -4,10 +4,11 @@ Simple Test Runner for AI Pipeline Analytics Dashboard
 Runs tests and generates basic coverage report
 """
 
-import subprocess
 import sys
 import os
 
+from script_utils import run_pytest
+
 def run_basic_tests():
     """Run basic test suite with coverage"""
     print("🧪 Running AI Pipeline Analytics Tests")
@@ -22,22 +23,23 @@ def run_basic_tests():
     # Simple test run
     try:
         print("📊 Running tests with coverage...")
-        result = subprocess.run([
-            sys.executable, '-m', 'pytest', 'tests/', '-v',
+        rc = run_pytest([
+            'tests/', '-v',
             '--cov=analytics_dashboard',
             '--cov-report=term-missing',
             '--cov-report=html',
             '--tb=short'
-        ], check=True)
+        ])
+        
+        if rc != 0:
+            print(f"\n❌ Tests failed with exit code: {rc}")
+            return False
         
         print("\n✅ Tests completed successfully!")
         print("📄 Coverage report available in htmlcov/index.html")
         return True
         
-    except subprocess.CalledProcessError as e:
-        print(f"\n❌ Tests failed with exit code: {e.returncode}")
-        return False
-    except FileNotFoundError:
+    except ImportError:
         print("❌ pytest not found. Install with: pip install pytest pytest-cov")
         return False
 
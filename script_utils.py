@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the project's command-line scripts
+(run_demo_dashboard.py, final_project_demo.py, run_tests.py, coverage_report.py)
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import sysconfig
+import subprocess
+
+REQS_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'aipdash', 'reqs.json')
+REQS_CACHE_MAX_AGE = 24 * 60 * 60
+
+def reqs_fingerprint():
+    """Identify the current interpreter and the state of its site-packages"""
+    site_packages = sysconfig.get_paths()['purelib']
+    try:
+        mtime = os.path.getmtime(site_packages)
+    except OSError:
+        mtime = 0
+    return hashlib.blake2b((sys.executable + str(mtime)).encode()).hexdigest()
+
+def _load_reqs_marker(fingerprint):
+    """The marker for this environment, or None if missing, stale or foreign"""
+    try:
+        with open(REQS_CACHE_PATH, 'r') as f:
+            marker = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (marker.get('fingerprint') != fingerprint
+            or time.time() - marker.get('checked_at', 0) >= REQS_CACHE_MAX_AGE):
+        return None
+    return marker
+
+def reqs_cached(packages, fingerprint):
+    """True if a fresh marker shows these packages were importable before"""
+    marker = _load_reqs_marker(fingerprint)
+    return marker is not None and set(packages) <= set(marker.get('packages', []))
+
+def save_reqs_marker(packages, fingerprint):
+    """Atomically record a successful probe so later runs can skip it
+
+    Packages already recorded for this environment are kept, so scripts
+    that check different package lists don't invalidate each other.
+    """
+    marker = _load_reqs_marker(fingerprint)
+    # Keep the original check time, so merging never extends the marker's age
+    if marker is not None:
+        packages = set(packages) | set(marker.get('packages', []))
+        checked_at = marker['checked_at']
+    else:
+        checked_at = time.time()
+    try:
+        os.makedirs(os.path.dirname(REQS_CACHE_PATH), exist_ok=True)
+        tmp_path = f"{REQS_CACHE_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'fingerprint': fingerprint, 'checked_at': checked_at,
+                       'packages': sorted(packages)}, f)
+        os.replace(tmp_path, REQS_CACHE_PATH)
+    except OSError:
+        pass
+
+def run_pytest(args, in_process=None):
+    """Run pytest with the given arguments and return its exit code.
+
+    Runs in this interpreter to skip a fresh Python startup and plugin
+    discovery. Pass in_process=False, or set AIP_INPROC_PYTEST=0, to run it
+    in an isolated subprocess instead. pytest.main is not meant to be called
+    more than once per interpreter, so callers with several runs should keep
+    at most one of them in process.
+    """
+    if in_process is None:
+        in_process = os.environ.get('AIP_INPROC_PYTEST', '1') != '0'
+    if in_process:
+        import pytest
+        rc = int(pytest.main(args))
+        # Streamlit log handlers created during the run point at pytest's
+        # closed capture stream; rebind them to the real sys.stderr
+        if 'streamlit.logger' in sys.modules:
+            sys.modules['streamlit.logger'].update_formatter()
+        return rc
+    return subprocess.run([sys.executable, '-m', 'pytest', *args]).returncode
+
+def count_lines(path):
+    """Count lines like len(f.readlines()) by scanning 64 KB binary chunks"""
+    lines = 0
+    last = b'\n'
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            chunk = f.read(1 << 16)
+            if not chunk:
+                break
+            lines += chunk.count(b'\n')
+            last = chunk[-1:]
+    # A final line without a trailing newline still counts
+    return lines + (last != b'\n')
+
+def count_lines_safe(path):
+    """(counted, lines) for a file; missing (None) or unreadable files are not counted"""
+    if path is None:
+        return False, 0
+    try:
+        return True, count_lines(path)
+    except OSError:
+        return False, 0
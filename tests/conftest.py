@@ -0,0 +1,28 @@
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+from botocore.exceptions import NoCredentialsError
+
+# Add parent directory to path to import the dashboard module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analytics_dashboard
+
+
+@pytest.fixture(autouse=True, scope='session')
+def offline_aws_session():
+    """Keep the whole suite in demo mode without touching real AWS.
+
+    Client creation fails fast with NoCredentialsError, so no test walks the
+    credential chain or waits on an STS call. Tests that need working clients
+    patch boto3.session.Session themselves, which overrides this patch.
+    """
+    analytics_dashboard._aws_session.clear()
+    analytics_dashboard._aws_clients.clear()
+    with patch('boto3.session.Session') as mock_session:
+        mock_session.return_value.client.side_effect = NoCredentialsError()
+        yield mock_session
+    analytics_dashboard._aws_session.clear()
+    analytics_dashboard._aws_clients.clear()
@@ -1,7 +1,9 @@
+import copy
 import unittest
 import pytest
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, MagicMock
 import sys
@@ -12,31 +14,59 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import analytics_dashboard
 
+def _log_item(**overrides):
+    """One DynamoDB log item; analysis fields such as word_count can be overridden by name too"""
+    analysis = {'complexity': 'low', 'word_count': 3, 'has_code': False, 'has_question': True}
+    for field in analysis.keys() & overrides.keys():
+        analysis[field] = overrides.pop(field)
+    item = {
+        'pipeline_id': 'pipeline_0001',
+        'timestamp': datetime.now().isoformat(),
+        'user_message': 'What is AI?',
+        'analysis': analysis,
+        'execution_time_ms': 500,
+        'status': 'SUCCESS'
+    }
+    item.update(overrides)
+    return item
+
 class TestAIPipelineAnalytics(unittest.TestCase):
     """Test suite for AI Pipeline Analytics Dashboard"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create the analytics instance once for the whole class."""
+        cls._shared = analytics_dashboard.AIPipelineAnalytics()
+        
     def setUp(self):
         """Set up test fixtures before each test method."""
-        self.analytics = analytics_dashboard.AIPipelineAnalytics()
+        # Tests swap in mock clients and flip use_aws, so each gets its own shallow copy
+        self.analytics = copy.copy(self._shared)
         
-    @patch('boto3.resource')
-    @patch('boto3.client')
-    def test_setup_aws_clients_success(self, mock_client, mock_resource):
+    @patch('boto3.session.Session')
+    def test_setup_aws_clients_success(self, mock_session):
         """Test successful AWS client setup"""
         # Mock successful STS call
         mock_sts = Mock()
         mock_sts.get_caller_identity.return_value = {'Account': '123456789'}
-        mock_client.return_value = mock_sts
+        mock_session.return_value.client.return_value = mock_sts
+        # Bypass the process-wide session/client caches, and keep these mocks out of them afterwards
+        analytics_dashboard._aws_session.clear()
+        analytics_dashboard._aws_clients.clear()
+        self.addCleanup(analytics_dashboard._aws_session.clear)
+        self.addCleanup(analytics_dashboard._aws_clients.clear)
         
         analytics = analytics_dashboard.AIPipelineAnalytics()
         self.assertTrue(analytics.use_aws)
         
-    @patch('boto3.resource')
-    @patch('boto3.client')
-    def test_setup_aws_clients_failure(self, mock_client, mock_resource):
+    @patch('boto3.session.Session')
+    def test_setup_aws_clients_failure(self, mock_session):
         """Test AWS client setup failure fallback to mock data"""
         # Mock failed STS call
-        mock_client.side_effect = Exception("AWS credentials not configured")
+        mock_session.return_value.client.side_effect = Exception("AWS credentials not configured")
+        analytics_dashboard._aws_session.clear()
+        analytics_dashboard._aws_clients.clear()
+        self.addCleanup(analytics_dashboard._aws_session.clear)
         
         analytics = analytics_dashboard.AIPipelineAnalytics()
         self.assertFalse(analytics.use_aws)
@@ -59,6 +89,17 @@ class TestAIPipelineAnalytics(unittest.TestCase):
         self.assertIn(df['complexity'].iloc[0], ['low', 'medium', 'high'])
         self.assertIn(df['status'].iloc[0], ['SUCCESS', 'FAILED'])
         
+    def test_generate_mock_data_stable_within_cache_window(self):
+        """Test demo reruns inside one cache window see the same mock records"""
+        with patch('time.time', return_value=2_000_000.0):
+            first = self.analytics.generate_mock_data(hours=6)
+            second = self.analytics.generate_mock_data(hours=6)
+            other_window = self.analytics.generate_mock_data(hours=24)
+        
+        self.assertTrue(first.equals(second))
+        # The window length is part of the seed, so other windows get their own records
+        self.assertFalse(first['execution_time_ms'].equals(other_window['execution_time_ms']))
+        
     def test_generate_mock_data_time_range(self):
         """Test mock data generation respects time range"""
         hours = 12
@@ -105,6 +146,17 @@ class TestAIPipelineAnalytics(unittest.TestCase):
         self.assertEqual(metrics['avg_response_time'], 3000)  # mean of execution times
         self.assertEqual(metrics['avg_word_count'], 30)  # mean of word counts
         
+    def test_generate_summary_matches_calculated_metrics(self):
+        """Test the fused mock summary reports the same metrics as a pass over its frame"""
+        df, metrics = self.analytics.generate_summary(hours=24)
+        expected = self.analytics.calculate_performance_metrics(df)
+        
+        self.assertEqual(metrics.keys(), expected.keys())
+        self.assertEqual(metrics['complexity_distribution'], expected['complexity_distribution'])
+        for key in ('total_executions', 'success_rate', 'avg_response_time', 'avg_word_count',
+                    'code_requests_percentage', 'question_percentage'):
+            self.assertAlmostEqual(metrics[key], expected[key])
+        
     def test_calculate_performance_metrics_empty_dataframe(self):
         """Test performance metrics with empty DataFrame"""
         df = pd.DataFrame()
@@ -131,6 +183,42 @@ class TestAIPipelineAnalytics(unittest.TestCase):
                 
         self.assertIn('executions_succeeded', metrics)
         self.assertIn('executions_failed', metrics)
+
+    def test_generate_mock_cloudwatch_metrics_cached_within_window(self):
+        """Test mock CloudWatch metrics are built once per cache window"""
+        with patch('time.time', return_value=2_000_000.0):
+            first = self.analytics.generate_mock_cloudwatch_metrics()
+            second = self.analytics.generate_mock_cloudwatch_metrics()
+        with patch('time.time', return_value=2_000_000.0 + analytics_dashboard.CACHE_TTL_SECONDS):
+            third = self.analytics.generate_mock_cloudwatch_metrics()
+
+        self.assertIsNot(first, second)
+        self.assertIs(first['executions_failed'], second['executions_failed'])
+        self.assertIsNot(first['executions_failed'], third['executions_failed'])
+
+    def test_get_cloudwatch_metrics_single_request(self):
+        """Test CloudWatch metrics are fetched with one batched GetMetricData call"""
+        timestamp = datetime.now()
+        
+        def metric_data(MetricDataQueries, **kwargs):
+            return {'MetricDataResults': [
+                {'Id': query['Id'], 'Timestamps': [timestamp], 'Values': [100.0]}
+                for query in MetricDataQueries
+            ]}
+        
+        self.analytics.use_aws = True
+        self.analytics.cloudwatch = Mock()
+        self.analytics.cloudwatch.get_metric_data.side_effect = metric_data
+        
+        metrics = self.analytics.fetch_cloudwatch_metrics(hours=24)
+        
+        self.analytics.cloudwatch.get_metric_data.assert_called_once()
+        self.assertEqual(
+            metrics['InputAnalyzerFunction'],
+            [{'Timestamp': timestamp, 'Average': 100.0, 'Maximum': 100.0, 'Minimum': 100.0}]
+        )
+        self.assertEqual(metrics['executions_succeeded'], [{'Timestamp': timestamp, 'Sum': 100.0}])
+        self.assertIn('executions_failed', metrics)
         
     @patch.object(analytics_dashboard.AIPipelineAnalytics, 'generate_mock_data')
     def test_get_pipeline_logs_mock_mode(self, mock_generate):
@@ -144,15 +232,118 @@ class TestAIPipelineAnalytics(unittest.TestCase):
         result = self.analytics.get_pipeline_logs(hours=24)
         
         mock_generate.assert_called_once_with(24)
-        self.assertEqual(result.equals(mock_df), True)
+        self.assertIs(result, mock_df)
+        
+    @patch.object(analytics_dashboard.AIPipelineAnalytics, 'fetch_pipeline_logs')
+    def test_get_pipeline_logs_cached_between_reruns(self, mock_fetch):
+        """Test repeated AWS log reads inside one cache window hit DynamoDB once"""
+        mock_fetch.return_value = pd.DataFrame({'test': [1, 2, 3]})
+        analytics_dashboard._cached_pipeline_logs.clear()
+        self.addCleanup(analytics_dashboard._cached_pipeline_logs.clear)
+        
+        self.analytics.use_aws = True
+        with patch('time.time', return_value=1_000_000.0):
+            first = self.analytics.get_pipeline_logs(hours=6)
+            second = self.analytics.get_pipeline_logs(hours=6)
+        
+        mock_fetch.assert_called_once_with(6)
+        self.assertTrue(first.equals(second))
+        
+    def test_get_pipeline_logs_queries_time_index(self):
+        """Test pipeline logs are read page by page from the time index"""
+        item = _log_item()
+        mock_table = Mock()
+        mock_table.query.side_effect = [
+            {'Items': [item], 'LastEvaluatedKey': {'pipeline_id': 'pipeline_0001'}},
+            {'Items': [_log_item(pipeline_id='pipeline_0002')]}
+        ]
+        self.analytics.use_aws = True
+        self.analytics.dynamodb = Mock()
+        self.analytics.dynamodb.Table.return_value = mock_table
+        
+        df = self.analytics.fetch_pipeline_logs(hours=24)
+        
+        self.assertEqual(mock_table.query.call_count, 2)
+        first_call, second_call = mock_table.query.call_args_list
+        self.assertEqual(first_call.kwargs['IndexName'], 'ByTime')
+        self.assertEqual(second_call.kwargs['ExclusiveStartKey'], {'pipeline_id': 'pipeline_0001'})
+        self.assertEqual(list(df['pipeline_id']), ['pipeline_0001', 'pipeline_0002'])
+        
+    def test_get_pipeline_logs_scan_fallback_without_index(self):
+        """Test pipeline logs fall back to a paginated scan when the time index is missing"""
+        from botocore.exceptions import ClientError
+        
+        item = _log_item()
+        mock_table = Mock()
+        mock_table.query.side_effect = ClientError(
+            {'Error': {'Code': 'ValidationException', 'Message': 'no such index'}}, 'Query'
+        )
+        mock_paginator = Mock()
+        mock_paginator.paginate.return_value = iter([{'Items': [item]}, {'Items': [item]}])
+        self.analytics.use_aws = True
+        self.analytics.dynamodb = Mock()
+        self.analytics.dynamodb.Table.return_value = mock_table
+        self.analytics.dynamodb.meta.client.get_paginator.return_value = mock_paginator
+        
+        df = self.analytics.fetch_pipeline_logs(hours=24)
+        
+        self.analytics.dynamodb.meta.client.get_paginator.assert_called_once_with('scan')
+        scan_kwargs = mock_paginator.paginate.call_args.kwargs
+        self.assertIn('FilterExpression', scan_kwargs)
+        self.assertIn('analysis.complexity', scan_kwargs['ProjectionExpression'])
+        self.assertEqual(len(df), 2)
+        self.assertEqual(df['complexity'].iloc[0], 'low')
+        
+    def test_logs_to_dataframe_keeps_out_of_range_counts(self):
+        """Test a value too wide for the narrow dtypes keeps the real rows instead of failing"""
+        item = _log_item()
+        wide = _log_item(pipeline_id='pipeline_0002', execution_time_ms=2**40, word_count=40000)
+        
+        df = self.analytics.logs_to_dataframe([item, wide])
+        
+        self.assertEqual(list(df['execution_time_ms']), [500, 2**40])
+        self.assertEqual(list(df['word_count']), [3, 40000])
+        # In-range columns are still narrowed
+        narrow = self.analytics.logs_to_dataframe([item])
+        self.assertEqual(narrow['execution_time_ms'].dtype, pd.ArrowDtype(pa.int32()))
+        self.assertEqual(narrow['word_count'].dtype, pd.ArrowDtype(pa.int16()))
+        
+    def test_logs_to_dataframe_coerces_mixed_types(self):
+        """Test one item with drifted types doesn't discard the rest of the real rows"""
+        items = [
+            _log_item(),
+            _log_item(pipeline_id='pipeline_0002', execution_time_ms='750', has_code='true'),
+            _log_item(pipeline_id='pipeline_0003', analysis='not a map'),
+            _log_item(pipeline_id='pipeline_0004', execution_time_ms='n/a'),
+            _log_item(pipeline_id='pipeline_0005', timestamp=1700000000)
+        ]
+        
+        df = self.analytics.logs_to_dataframe(items)
+        
+        # Convertible values are coerced; items that still don't fit are dropped alone
+        self.assertEqual(
+            list(df['pipeline_id']), ['pipeline_0001', 'pipeline_0002', 'pipeline_0003']
+        )
+        self.assertEqual(list(df['execution_time_ms']), [500, 750, 500])
+        self.assertEqual(list(df['has_code']), [False, True, False])
+        self.assertEqual(df['complexity'].iloc[2], 'unknown')
         
     def test_execution_time_complexity_correlation(self):
         """Test that execution time correlates with complexity"""
         df = self.analytics.generate_mock_data(hours=24)
         
         if not df.empty and len(df) > 10:
-            # Group by complexity and check mean execution times
-            complexity_times = df.groupby('complexity')['execution_time_ms'].mean()
+            # Mean execution time per complexity level from integer codes
+            complexity = pd.Categorical(df['complexity'])
+            codes = complexity.codes
+            levels = len(complexity.categories)
+            exec_times = df['execution_time_ms'].to_numpy(dtype=float)
+            sums = np.bincount(codes, weights=exec_times, minlength=levels)
+            counts = np.bincount(codes, minlength=levels)
+            complexity_times = {
+                level: sums[i] / counts[i]
+                for i, level in enumerate(complexity.categories) if counts[i]
+            }
             
             if 'low' in complexity_times and 'high' in complexity_times:
                 # High complexity should generally take longer than low complexity
@@ -162,8 +353,9 @@ class TestAIPipelineAnalytics(unittest.TestCase):
 class TestDataValidation(unittest.TestCase):
     """Test data validation and edge cases"""
     
-    def setUp(self):
-        self.analytics = analytics_dashboard.AIPipelineAnalytics()
+    @classmethod
+    def setUpClass(cls):
+        cls.analytics = analytics_dashboard.AIPipelineAnalytics()
         
     def test_empty_data_handling(self):
         """Test handling of empty datasets"""
@@ -195,8 +387,9 @@ class TestDataValidation(unittest.TestCase):
 class TestPerformance(unittest.TestCase):
     """Performance tests for analytics functions"""
     
-    def setUp(self):
-        self.analytics = analytics_dashboard.AIPipelineAnalytics()
+    @classmethod
+    def setUpClass(cls):
+        cls.analytics = analytics_dashboard.AIPipelineAnalytics()
         
     def test_large_dataset_performance(self):
         """Test performance with large datasets"""
@@ -204,7 +397,8 @@ class TestPerformance(unittest.TestCase):
         
         # Generate large dataset
         start_time = time.time()
-        large_df = self.analytics.generate_mock_data(hours=168)  # 1 week
+        # build_mock_data skips the per-window cache, so this times a real generation
+        large_df = self.analytics.build_mock_data(hours=168)  # 1 week
         generation_time = time.time() - start_time
         
         # Should generate data reasonably quickly (< 5 seconds)
@@ -220,18 +414,18 @@ class TestPerformance(unittest.TestCase):
         
     def test_memory_efficiency(self):
         """Test memory usage doesn't grow excessively"""
-        import psutil
-        import os
+        import tracemalloc
         
-        process = psutil.Process(os.getpid())
-        initial_memory = process.memory_info().rss
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        initial_memory = tracemalloc.get_traced_memory()[0]
         
-        # Generate multiple datasets
+        # Generate multiple datasets; uncached, so every iteration draws anew
         for _ in range(10):
-            df = self.analytics.generate_mock_data(hours=24)
+            df = self.analytics.build_mock_data(hours=24)
             metrics = self.analytics.calculate_performance_metrics(df)
             
-        final_memory = process.memory_info().rss
+        final_memory = tracemalloc.get_traced_memory()[0]
         memory_increase = final_memory - initial_memory
         
         # Memory increase should be reasonable (< 100MB)
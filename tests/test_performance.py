@@ -1,9 +1,10 @@
 import unittest
 import time
+import pytest
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import psutil
+import tracemalloc
 import os
 import sys
 
@@ -12,157 +13,188 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import analytics_dashboard
 
-class TestPerformanceBenchmarks(unittest.TestCase):
-    """Performance benchmarking tests for AI Pipeline Analytics"""
+MOCK_DATA_SIZES = [10, 100, 500, 1000]
+METRICS_SIZES = [100, 500, 1000, 2000]
+
+def benchmark_function(func, *args, rounds=5, **kwargs):
+    """Benchmark a function and return execution time and memory usage"""
+    # One untimed warm-up call, so import and first-use costs are not measured
+    func(*args, **kwargs)
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.analytics = analytics_dashboard.AIPipelineAnalytics()
-        self.process = psutil.Process(os.getpid())
-        
-    def benchmark_function(self, func, *args, **kwargs):
-        """Benchmark a function and return execution time and memory usage"""
-        # Measure initial memory
-        initial_memory = self.process.memory_info().rss
-        
-        # Measure execution time
-        start_time = time.time()
+    # Measure memory over the first timed round
+    initial_memory = tracemalloc.get_traced_memory()[0]
+    
+    # Measure execution time as the median of several perf_counter rounds
+    timings = []
+    for _ in range(rounds):
+        start_time = time.perf_counter()
         result = func(*args, **kwargs)
-        end_time = time.time()
-        
-        # Measure final memory
-        final_memory = self.process.memory_info().rss
-        
-        return {
-            'result': result,
-            'execution_time': end_time - start_time,
-            'memory_used': final_memory - initial_memory,
-            'initial_memory': initial_memory,
-            'final_memory': final_memory
-        }
-        
-    def test_mock_data_generation_performance(self):
-        """Benchmark mock data generation performance - O(n) complexity"""
-        print("\n=== Mock Data Generation Performance ===")
-        
-        sizes = [10, 100, 500, 1000]
-        results = []
-        
-        for size in sizes:
-            # Calculate hours needed for approximately 'size' records
-            hours = max(1, size // 10)
-            
-            benchmark = self.benchmark_function(
-                self.analytics.generate_mock_data, 
-                hours=hours
-            )
-            
-            df = benchmark['result']
-            records = len(df) if not df.empty else 0
-            
-            results.append({
-                'target_size': size,
-                'actual_records': records,
-                'execution_time': benchmark['execution_time'],
-                'memory_used': benchmark['memory_used'],
-                'time_per_record': benchmark['execution_time'] / max(records, 1)
-            })
-            
-            print(f"Size: {size:4d} | Records: {records:4d} | "
-                  f"Time: {benchmark['execution_time']:.3f}s | "
-                  f"Memory: {benchmark['memory_used']/1024/1024:.1f}MB | "
-                  f"Time/Record: {benchmark['execution_time']/max(records, 1)*1000:.2f}ms")
+        timings.append(time.perf_counter() - start_time)
+        if len(timings) == 1:
+            final_memory = tracemalloc.get_traced_memory()[0]
+    
+    return {
+        'result': result,
+        'execution_time': float(np.median(timings)),
+        'memory_used': final_memory - initial_memory,
+        'initial_memory': initial_memory,
+        'final_memory': final_memory
+    }
+
+@pytest.fixture(scope='module')
+def analytics():
+    """One analytics instance per test module (and per xdist worker)"""
+    return analytics_dashboard.AIPipelineAnalytics()
+
+@pytest.fixture(scope='module')
+def metrics_frame():
+    """Largest metrics benchmark frame; each size benchmarks a row slice of it"""
+    # Labels are drawn as int8 codes and wrapped as categoricals, like the
+    # dashboard's own frames, instead of arrays of strings
+    max_size = max(METRICS_SIZES)
+    rng = np.random.default_rng()
+    status_codes = (rng.random(max_size) < 0.05).astype(np.int8)
+    complexity_codes = rng.integers(0, 3, max_size, dtype=np.int8)
+    return pd.DataFrame({
+        'execution_time_ms': rng.integers(100, 5000, max_size),
+        'status': pd.Categorical.from_codes(status_codes, categories=['SUCCESS', 'FAILED']),
+        'word_count': rng.integers(1, 100, max_size),
+        'complexity': pd.Categorical.from_codes(
+            complexity_codes, categories=['low', 'medium', 'high']
+        )
+    })
+
+@pytest.fixture(scope='module')
+def mock_data_results():
+    """Per-size mock generation benchmarks, keyed by size, for the aggregate tests"""
+    return {}
+
+@pytest.fixture
+def traced_memory():
+    """Trace allocations for the duration of one test"""
+    tracemalloc.start()
+    yield
+    tracemalloc.stop()
+
+def _benchmark_mock_data(analytics, size):
+    """Benchmark uncached mock generation for roughly `size` records"""
+    hours = max(1, size // 10)
+    # build_mock_data skips the per-window cache, so every round generates
+    benchmark = benchmark_function(analytics.build_mock_data, hours=hours)
+    records = len(benchmark['result'])
+    return {
+        'actual_records': records,
+        'execution_time': benchmark['execution_time'],
+        'memory_used': benchmark['memory_used'],
+        'time_per_record': benchmark['execution_time'] / max(records, 1)
+    }
+
+@pytest.fixture
+def mock_data_sweep(analytics, mock_data_results):
+    """Per-size results in size order, benchmarking any size this run has not covered yet"""
+    # Sizes are missing when run alone, under -k, out of order, or when
+    # pytest-xdist sent them to other workers
+    for size in MOCK_DATA_SIZES:
+        if size not in mock_data_results:
+            mock_data_results[size] = _benchmark_mock_data(analytics, size)
+    return [mock_data_results[size] for size in MOCK_DATA_SIZES]
+
+# Each size is its own test, so pytest-xdist (pytest -n auto) can spread a
+# sweep across workers
+@pytest.mark.parametrize('size', MOCK_DATA_SIZES)
+def test_mock_data_generation_time_per_record(analytics, traced_memory, mock_data_results, size):
+    """Mock data generation stays under 10ms per record at each sweep size"""
+    result = mock_data_results[size] = _benchmark_mock_data(analytics, size)
+    time_per_record = result['time_per_record']
+    
+    print(f"Size: {size:4d} | Records: {result['actual_records']:4d} | "
+          f"Time: {result['execution_time']:.3f}s | "
+          f"Memory: {result['memory_used']/1024/1024:.1f}MB | "
+          f"Time/Record: {time_per_record*1000:.2f}ms")
+    
+    assert time_per_record < 0.01, f"Too slow: {time_per_record*1000:.2f}ms per record"
+
+def test_mock_data_generation_performance(mock_data_sweep):
+    """Benchmark mock data generation performance - O(n) complexity"""
+    print("\n=== Mock Data Generation Performance ===")
+    results = mock_data_sweep
+    
+    # Verify O(n) complexity - time should scale roughly linearly
+    time_ratios = []
+    for i in range(1, len(results)):
+        if results[i-1]['actual_records'] > 0:
+            size_ratio = results[i]['actual_records'] / results[i-1]['actual_records']
+            time_ratio = results[i]['execution_time'] / results[i-1]['execution_time']
+            time_ratios.append(time_ratio / size_ratio)
+    
+    # Average ratio should be close to 1 for O(n) complexity
+    if time_ratios:
+        avg_ratio = np.mean(time_ratios)
+        print(f"Average time complexity ratio: {avg_ratio:.2f} (closer to 1.0 = better O(n))")
         
-        # Verify O(n) complexity - time should scale roughly linearly
-        if len(results) >= 2:
-            time_ratios = []
-            for i in range(1, len(results)):
-                if results[i-1]['actual_records'] > 0:
-                    size_ratio = results[i]['actual_records'] / results[i-1]['actual_records']
-                    time_ratio = results[i]['execution_time'] / results[i-1]['execution_time']
-                    time_ratios.append(time_ratio / size_ratio)
-            
-            # Average ratio should be close to 1 for O(n) complexity
-            if time_ratios:
-                avg_ratio = np.mean(time_ratios)
-                print(f"Average time complexity ratio: {avg_ratio:.2f} (closer to 1.0 = better O(n))")
-                
-                # Allow some variance but should be roughly linear
-                self.assertLess(avg_ratio, 3.0, "Data generation appears to be worse than O(n)")
-                
-        # Performance thresholds
-        for result in results:
-            self.assertLess(result['time_per_record'], 0.01, 
-                          f"Too slow: {result['time_per_record']*1000:.2f}ms per record")
-                          
-    def test_metrics_calculation_performance(self):
-        """Benchmark metrics calculation performance - O(n) complexity"""
-        print("\n=== Metrics Calculation Performance ===")
+        # Allow some variance but should be roughly linear
+        assert avg_ratio < 3.0, "Data generation appears to be worse than O(n)"
+
+@pytest.mark.parametrize('size', METRICS_SIZES)
+def test_metrics_calculation_performance(analytics, metrics_frame, traced_memory, size):
+    """Benchmark metrics calculation performance at each sweep size"""
+    benchmark = benchmark_function(
+        analytics.calculate_performance_metrics,
+        metrics_frame.iloc[:size]
+    )
+    time_per_record = benchmark['execution_time'] / size
+    
+    print(f"Size: {size:4d} | Time: {benchmark['execution_time']:.4f}s | "
+          f"Memory: {benchmark['memory_used']/1024:.1f}KB | "
+          f"Time/Record: {time_per_record*1000000:.2f}μs")
+    
+    assert benchmark['execution_time'] < 1.0, "Metrics calculation should complete within 1 second"
+    assert time_per_record < 0.001, "Should process over 1000 records per second"
+
+class TestPerformanceBenchmarks(unittest.TestCase):
+    """Performance benchmarking tests for AI Pipeline Analytics"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by every benchmark"""
+        cls.analytics = analytics_dashboard.AIPipelineAnalytics()
         
-        dataset_sizes = [100, 500, 1000, 2000]
-        results = []
+    def setUp(self):
+        """Trace allocations per test, so each test's peak starts from its own baseline"""
+        tracemalloc.start()
         
-        for size in dataset_sizes:
-            # Generate test dataset
-            test_data = {
-                'execution_time_ms': np.random.randint(100, 5000, size),
-                'status': np.random.choice(['SUCCESS', 'FAILED'], size, p=[0.95, 0.05]),
-                'word_count': np.random.randint(1, 100, size),
-                'complexity': np.random.choice(['low', 'medium', 'high'], size)
-            }
-            df = pd.DataFrame(test_data)
-            
-            benchmark = self.benchmark_function(
-                self.analytics.calculate_performance_metrics,
-                df
-            )
-            
-            results.append({
-                'dataset_size': size,
-                'execution_time': benchmark['execution_time'],
-                'memory_used': benchmark['memory_used'],
-                'time_per_record': benchmark['execution_time'] / size
-            })
-            
-            print(f"Size: {size:4d} | Time: {benchmark['execution_time']:.4f}s | "
-                  f"Memory: {benchmark['memory_used']/1024:.1f}KB | "
-                  f"Time/Record: {benchmark['execution_time']/size*1000000:.2f}μs")
+    def tearDown(self):
+        tracemalloc.stop()
         
-        # Verify performance thresholds
-        for result in results:
-            self.assertLess(result['execution_time'], 1.0, 
-                          "Metrics calculation should complete within 1 second")
-            self.assertLess(result['time_per_record'], 0.001, 
-                          "Should process over 1000 records per second")
-                          
     def test_dashboard_load_time(self):
         """Test overall dashboard load time simulation"""
         print("\n=== Dashboard Load Time Simulation ===")
         
         # Simulate dashboard loading process
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # 1. Initialize analytics
-        init_time = time.time()
+        init_time = time.perf_counter()
         analytics = analytics_dashboard.AIPipelineAnalytics()
-        init_duration = time.time() - init_time
+        init_duration = time.perf_counter() - init_time
         
-        # 2. Generate/load data
-        data_time = time.time()
-        df = analytics.get_pipeline_logs(hours=24)
-        data_duration = time.time() - data_time
+        # 2. Generate/load data and calculate metrics in one fused pass,
+        #    as the dashboard does
+        data_time = time.perf_counter()
+        df, metrics = analytics.generate_summary(hours=24)
+        data_duration = time.perf_counter() - data_time
         
-        # 3. Calculate metrics
-        metrics_time = time.time()
-        metrics = analytics.calculate_performance_metrics(df)
-        metrics_duration = time.time() - metrics_time
+        # 3. Metrics from a separate pass over the loaded frame, for comparison
+        metrics_time = time.perf_counter()
+        analytics.calculate_performance_metrics(df)
+        metrics_duration = time.perf_counter() - metrics_time
         
         # 4. Generate CloudWatch metrics
-        cloudwatch_time = time.time()
+        cloudwatch_time = time.perf_counter()
         cw_metrics = analytics.generate_mock_cloudwatch_metrics()
-        cloudwatch_duration = time.time() - cloudwatch_time
+        cloudwatch_duration = time.perf_counter() - cloudwatch_time
         
-        total_duration = time.time() - start_time
+        total_duration = time.perf_counter() - start_time
         
         print(f"Initialization: {init_duration:.3f}s")
         print(f"Data Loading:   {data_duration:.3f}s")
@@ -179,13 +211,12 @@ class TestPerformanceBenchmarks(unittest.TestCase):
         """Test memory usage efficiency and potential memory leaks"""
         print("\n=== Memory Efficiency Test ===")
         
-        initial_memory = self.process.memory_info().rss
-        peak_memory = initial_memory
+        initial_memory = tracemalloc.get_traced_memory()[0]
         
         # Simulate multiple dashboard refreshes
         for i in range(10):
-            # Generate data
-            df = self.analytics.generate_mock_data(hours=24)
+            # Generate data; build_mock_data skips the cache, so every refresh draws anew
+            df = self.analytics.build_mock_data(hours=24)
             
             # Calculate metrics
             metrics = self.analytics.calculate_performance_metrics(df)
@@ -193,15 +224,11 @@ class TestPerformanceBenchmarks(unittest.TestCase):
             # Generate CloudWatch metrics
             cw_metrics = self.analytics.generate_mock_cloudwatch_metrics()
             
-            # Check current memory
-            current_memory = self.process.memory_info().rss
-            if current_memory > peak_memory:
-                peak_memory = current_memory
-                
             # Clean up references
             del df, metrics, cw_metrics
             
-        final_memory = self.process.memory_info().rss
+        # tracemalloc keeps the peak itself, so no per-iteration polling is needed
+        final_memory, peak_memory = tracemalloc.get_traced_memory()
         memory_increase = final_memory - initial_memory
         peak_increase = peak_memory - initial_memory
         
@@ -219,54 +246,40 @@ class TestPerformanceBenchmarks(unittest.TestCase):
         """Simulate concurrent processing to test threading behavior"""
         print("\n=== Concurrent Processing Simulation ===")
         
-        import threading
-        import queue
+        from concurrent.futures import ThreadPoolExecutor
         
-        def worker(analytics, result_queue, worker_id):
+        def worker(worker_id):
             """Worker function for threading test"""
             start_time = time.time()
             try:
-                df = analytics.generate_mock_data(hours=12)
-                metrics = analytics.calculate_performance_metrics(df)
+                df = self.analytics.generate_mock_data(hours=12)
+                metrics = self.analytics.calculate_performance_metrics(df)
                 execution_time = time.time() - start_time
-                result_queue.put({
+                return {
                     'worker_id': worker_id,
                     'success': True,
                     'execution_time': execution_time,
                     'records': len(df) if not df.empty else 0
-                })
+                }
             except Exception as e:
-                result_queue.put({
+                return {
                     'worker_id': worker_id,
                     'success': False,
                     'error': str(e),
                     'execution_time': time.time() - start_time
-                })
+                }
         
         # Test with multiple concurrent workers
         num_workers = 5
-        result_queue = queue.Queue()
-        threads = []
         
         start_time = time.time()
         
-        # Start all workers
-        for i in range(num_workers):
-            thread = threading.Thread(target=worker, args=(self.analytics, result_queue, i))
-            threads.append(thread)
-            thread.start()
-            
-        # Wait for all workers to complete
-        for thread in threads:
-            thread.join()
+        # Run all workers and collect their results in worker order
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            results = list(executor.map(worker, range(num_workers)))
             
         total_time = time.time() - start_time
         
-        # Collect results
-        results = []
-        while not result_queue.empty():
-            results.append(result_queue.get())
-            
         successful_workers = [r for r in results if r['success']]
         failed_workers = [r for r in results if not r['success']]
         
@@ -285,55 +298,46 @@ class TestPerformanceBenchmarks(unittest.TestCase):
         # Concurrent processing should be reasonably efficient
         self.assertLess(total_time, 10.0, "Concurrent processing should complete within 10 seconds")
 
-class TestScalabilityAnalysis(unittest.TestCase):
+class TestScalabilityAnalysis:
     """Analyze system scalability characteristics"""
     
-    def test_big_o_analysis(self):
+    def test_big_o_analysis(self, mock_data_sweep):
         """Analyze Big O complexity of key operations"""
         print("\n=== Big O Complexity Analysis ===")
         
-        analytics = analytics_dashboard.AIPipelineAnalytics()
-        
-        # Test data generation complexity
-        sizes = [50, 100, 200, 400]
-        generation_times = []
+        # Reuse the mock generation sweep instead of timing it again
+        generation_times = [
+            (result['actual_records'], result['execution_time'])
+            for result in mock_data_sweep
+        ]
         
         print("\nData Generation Complexity:")
-        for size in sizes:
-            hours = max(1, size // 20)  # Approximate hours for target size
-            
-            start_time = time.time()
-            df = analytics.generate_mock_data(hours=hours)
-            execution_time = time.time() - start_time
-            
-            actual_size = len(df) if not df.empty else 0
-            generation_times.append((actual_size, execution_time))
-            
-            print(f"n={actual_size:3d}: {execution_time:.4f}s ({execution_time/actual_size*1000:.2f}ms/record)")
+        for actual_size, execution_time in generation_times:
+            print(f"n={actual_size:3d}: {execution_time:.4f}s "
+                  f"({execution_time/actual_size*1000:.2f}ms/record)")
             
         # Analyze complexity trend
-        if len(generation_times) >= 2:
-            print("\nComplexity Analysis:")
-            for i in range(1, len(generation_times)):
-                prev_size, prev_time = generation_times[i-1]
-                curr_size, curr_time = generation_times[i]
+        print("\nComplexity Analysis:")
+        for i in range(1, len(generation_times)):
+            prev_size, prev_time = generation_times[i-1]
+            curr_size, curr_time = generation_times[i]
+            
+            if prev_size > 0 and prev_time > 0:
+                size_ratio = curr_size / prev_size
+                time_ratio = curr_time / prev_time
+                complexity_indicator = time_ratio / size_ratio
+                
+                print(f"  Size ratio: {size_ratio:.2f}, Time ratio: {time_ratio:.2f}, "
+                      f"Complexity indicator: {complexity_indicator:.2f}")
                 
-                if prev_size > 0 and prev_time > 0:
-                    size_ratio = curr_size / prev_size
-                    time_ratio = curr_time / prev_time
-                    complexity_indicator = time_ratio / size_ratio
-                    
-                    print(f"  Size ratio: {size_ratio:.2f}, Time ratio: {time_ratio:.2f}, "
-                          f"Complexity indicator: {complexity_indicator:.2f}")
-                    
-                    # For O(n), complexity indicator should be close to 1
-                    # For O(n²), it would be close to size_ratio
-                    if complexity_indicator < 2.0:
-                        print(f"    → Appears to be O(n) - Linear complexity ✓")
-                    elif complexity_indicator < size_ratio * 1.5:
-                        print(f"    → Appears to be O(n log n) complexity ⚠")
-                    else:
-                        print(f"    → May be O(n²) or worse complexity ❌")
+                # For O(n), complexity indicator should be close to 1
+                # For O(n²), it would be close to size_ratio
+                if complexity_indicator < 2.0:
+                    print(f"    → Appears to be O(n) - Linear complexity ✓")
+                elif complexity_indicator < size_ratio * 1.5:
+                    print(f"    → Appears to be O(n log n) complexity ⚠")
+                else:
+                    print(f"    → May be O(n²) or worse complexity ❌")
 
 if __name__ == '__main__':
     unittest.main(verbosity=2) 
\ No newline at end of file